@@ -0,0 +1,46 @@
+"""
+Ahead-of-time compiles the Numba kernels into src/_kernels_aot (a native
+extension), so the dashboard and main.py skip JIT compilation on first use.
+
+Usage:
+    python build_aot.py
+
+The modules pick the extension up automatically when present and fall back
+to the @njit kernels otherwise.
+"""
+import os
+
+from numba.pycc import CC
+
+from src._njit import kernel_source_hash
+from src.kalman import _kalman_loop
+from src.strategy import _position_fsm
+
+cc = CC('_kernels_aot')
+cc.output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+
+# (X, Y, delta, R, m0, p0) -> (beta, spread, var, std, state_mean, state_cov)
+cc.export(
+    'kalman_loop',
+    'Tuple((f4[:], f4[:], f4[:], f4[:], f8, f8))(f8[:], f8[:], f8, f8, f8, f8)'
+)(_kalman_loop.py_func)
+
+# (z, entry, exit) -> position; z is float32 from the Kalman output, float64 otherwise
+cc.export('position_fsm_f4', 'i1[:](f4[:], f8, f8)')(_position_fsm.py_func)
+cc.export('position_fsm_f8', 'i1[:](f8[:], f8, f8)')(_position_fsm.py_func)
+
+# <name>_source_hash() lets aot_kernel reject a build made from older kernel source.
+# Exports are not type-checked at call time: callers must pass exactly these dtypes.
+def _export_source_hash(name, kernel):
+    value = kernel_source_hash(kernel)
+    
+    def source_hash():
+        return value
+    cc.export(name + '_source_hash', 'i8()')(source_hash)
+
+_export_source_hash('kalman_loop', _kalman_loop)
+_export_source_hash('position_fsm_f4', _position_fsm)
+_export_source_hash('position_fsm_f8', _position_fsm)
+
+if __name__ == "__main__":
+    cc.compile()
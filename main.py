@@ -1,6 +1,5 @@
 import sys
 import os
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
@@ -11,7 +10,11 @@ from src.kalman import KalmanFilterReg
 from src.strategy import StrategyAnalyzer
 from src.backtester import VectorizedBacktester
 
-def run_project():
+def run_project(delta=1e-4, entry_z=2.0, plot=False):
+    """
+    Runs the full pipeline and returns the backtest metrics (None if no data).
+    Plotting is opt-in so parameter sweeps only pay for the numerics.
+    """
     print("=== Phase 4: Full Backtest Execution ===")
     
     # 1. Config
@@ -23,20 +26,21 @@ def run_project():
     # 2. Pipeline Execution
     print(f"[1/4] Fetching Data ({TICKER_X} vs {TICKER_Y})...")
     df = fetch_pair_data(TICKER_X, TICKER_Y, START, END)
-    if df.empty: return
+    if df.empty: return None
     
     print("[2/4] Running Kalman Filter...")
-    kf = KalmanFilterReg(delta=1e-4, R=1e-3)
+    kf = KalmanFilterReg(delta=delta, R=1e-3)
     kf_results = kf.process_data(df[TICKER_X], df[TICKER_Y])
     
     print("[3/4] Generating Signals...")
-    # Strict entry (2.0 std), Quick exit (mean reversion to 0)
-    strat = StrategyAnalyzer(entry_threshold=2.0, exit_threshold=0.0)
+    # Strict entry (2.0 std by default), Quick exit (mean reversion to 0)
+    strat = StrategyAnalyzer(entry_threshold=entry_z, exit_threshold=0.0)
     signals = strat.generate_signals(kf_results)
     
     # Merge price data back into signals for PnL calc
-    signals[TICKER_X] = df[TICKER_X]
-    signals[TICKER_Y] = df[TICKER_Y]
+    # (same index by construction, so assign raw arrays and skip alignment)
+    signals[TICKER_X] = df[TICKER_X].to_numpy()
+    signals[TICKER_Y] = df[TICKER_Y].to_numpy()
     
     print("[4/4] Calculating PnL...")
     # 5 bps transaction cost (0.05%)
@@ -53,6 +57,16 @@ def run_project():
     print("="*30)
     
     # 4. Visualization
+    if plot:
+        plot_results(signals, metrics, TICKER_X, TICKER_Y, entry_z)
+    
+    return metrics
+
+def plot_results(signals, metrics, ticker_x, ticker_y, entry_z=2.0):
+    """Equity curve and Z-Score signal plots for a finished backtest."""
+    # Imported here so headless runs and sweeps never load a GUI backend
+    import matplotlib.pyplot as plt
+    
     plt.style.use('seaborn-v0_8-darkgrid')
     fig, axes = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
     
@@ -61,14 +75,14 @@ def run_project():
     axes[0].plot(equity.index, equity, color='green', linewidth=1.5)
     axes[0].fill_between(equity.index, equity, 0, where=(equity>0), color='green', alpha=0.1)
     axes[0].fill_between(equity.index, equity, 0, where=(equity<0), color='red', alpha=0.1)
-    axes[0].set_title(f"Cumulative Profit/Loss ({TICKER_X}/{TICKER_Y})")
+    axes[0].set_title(f"Cumulative Profit/Loss ({ticker_x}/{ticker_y})")
     axes[0].set_ylabel("PnL ($)")
     
     # Bottom Plot: The Spread and Entries
     spread = signals['z_score']
     axes[1].plot(spread.index, spread, label='Z-Score', color='gray', alpha=0.5)
-    axes[1].axhline(2.0, color='red', linestyle='--', alpha=0.5)
-    axes[1].axhline(-2.0, color='green', linestyle='--', alpha=0.5)
+    axes[1].axhline(entry_z, color='red', linestyle='--', alpha=0.5)
+    axes[1].axhline(-entry_z, color='green', linestyle='--', alpha=0.5)
     
     # Highlight positions
     in_position = signals['position'] != 0
@@ -82,4 +96,4 @@ def run_project():
     plt.show()
 
 if __name__ == "__main__":
-    run_project()
\ No newline at end of file
+    run_project(plot=True)
\ No newline at end of file
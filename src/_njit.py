@@ -0,0 +1,62 @@
+"""
+Optional Numba shim.
+
+Exposes `njit` and `prange` from numba when it is installed. Otherwise `njit`
+is a no-op decorator and `prange` is `range`, so the kernels still run
+(slowly) as plain Python.
+Also looks up the optional AOT-compiled kernels (see build_aot.py).
+"""
+
+import hashlib
+import importlib
+import inspect
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        # Supports both @njit and @njit(cache=True, ...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+def kernel_source_hash(kernel):
+    """
+    Fingerprint of a kernel's Python source, stored in the AOT extension at
+    build time so a stale build can be detected. Fits in a signed int64.
+    """
+    source = inspect.getsource(getattr(kernel, 'py_func', kernel))
+    return int(hashlib.sha256(source.encode()).hexdigest()[:15], 16)
+
+
+def aot_kernel(name, kernel):
+    """
+    Returns `name` from the ahead-of-time compiled extension built by
+    build_aot.py, or None if the extension has not been built or was built
+    from a different version of `kernel` (i.e. is stale).
+    
+    pycc exports do NOT check argument types: callers must pass exactly the
+    dtypes in the exported signature (see build_aot.py), or the result is garbage.
+    """
+    try:
+        if __package__:
+            module = importlib.import_module('._kernels_aot', __package__)
+        else:
+            module = importlib.import_module('_kernels_aot')
+    except ImportError:
+        return None
+    
+    func = getattr(module, name, None)
+    built_hash = getattr(module, name + '_source_hash', None)
+    if func is None or built_hash is None or built_hash() != kernel_source_hash(kernel):
+        print(f"⚠️ Ignoring stale AOT kernel '{name}'; re-run build_aot.py")
+        return None
+    return func
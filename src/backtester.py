@@ -1,6 +1,23 @@
 import pandas as pd
 import numpy as np
 
+
+def _diff(a):
+    """First difference along time (axis 0) with a 0 at t=0, in a single allocation."""
+    out = np.empty(a.shape, dtype=np.float64)
+    out[0] = 0.0
+    np.subtract(a[1:], a[:-1], out=out[1:])
+    return out
+
+
+def _lag(a):
+    """Value at t-1 (axis 0) with a 0 (flat) at t=0, in a single allocation."""
+    out = np.empty(a.shape, dtype=np.float64)
+    out[0] = 0.0
+    out[1:] = a[:-1]
+    return out
+
+
 class VectorizedBacktester:
     """
     Simulates the performance of the pair trading strategy.
@@ -19,59 +36,107 @@ class VectorizedBacktester:
     def run(self, signals: pd.DataFrame, ticker_x: str, ticker_y: str):
         """
         Calculates PnL based on positions and price changes.
+        Reads the signal columns as arrays. The equity curve is added to signals
+        IN PLACE as 'cumulative_pnl' (returned as 'full_df'); signals is never copied.
         """
-        df = signals.copy()
+        px = signals[ticker_x].to_numpy()
+        py = signals[ticker_y].to_numpy()
+        pos = signals['position'].to_numpy()
+        beta = signals['beta'].to_numpy()
         
-        # 1. Calculate Daily Price Changes ($ per share)
-        # We use diff() because we hold physical shares, not percent returns
-        df['dY'] = df[ticker_y].diff() # Change in Stock A
-        df['dX'] = df[ticker_x].diff() # Change in Stock B
+        # 1-2. Daily Net PnL (price changes, hedged PnL, transaction costs)
+        net_pnl = self._net_pnl(px, py, pos, beta)
         
-        # 2. Strategy PnL Formula
-        # We hold 1 share of Y and Short 'Beta' shares of X
-        # PnL = Position_{t-1} * ( Change_Y - Beta_{t-1} * Change_X )
-        df['strategy_pnl_daily'] = df['position'].shift(1) * (df['dY'] - df['beta'].shift(1) * df['dX'])
-        
-        # 3. Transaction Costs
-        # We pay costs whenever the position CHANGES (Buy or Sell)
-        # Cost estimate: |Change in Position| * Price * Cost_Bps
-        # Assuming avg price of ~$50 for simplicity in this vectorization, or use actual price
-        df['trades'] = df['position'].diff().abs()
-        
-        # Rough estimation of transaction value: Price_Y + Beta * Price_X
-        # We approximate trade value as roughly $100 per unit spread for cost calc
-        est_trade_value = (df[ticker_y] + df['beta'] * df[ticker_x]) 
-        df['costs'] = df['trades'] * est_trade_value * self.cost_bps
-        
-        # Net PnL
-        df['net_pnl'] = df['strategy_pnl_daily'] - df['costs'].fillna(0)
-        
-        # 4. Equity Curve
+        # 3. Equity Curve
         # We assume we allocate capital to hold roughly 100 units of the spread
         # (Scaling factor to make the PnL meaningful relative to capital)
         # For M.Tech, we can just sum the PnL per 1 unit spread
-        df['cumulative_pnl'] = df['net_pnl'].cumsum()
+        eq = np.cumsum(net_pnl)
+        equity = pd.Series(eq, index=signals.index, name='cumulative_pnl')
+        signals['cumulative_pnl'] = eq
         
-        # 5. Performance Metrics
-        total_return = df['cumulative_pnl'].iloc[-1]
-        sharpe = self._calculate_sharpe(df['net_pnl'])
-        drawdown = self._calculate_drawdown(df['cumulative_pnl'])
+        # 4. Performance Metrics (straight from the arrays)
+        total_return = float(eq[-1])
+        sharpe = self._calculate_sharpe(net_pnl)
+        drawdown = self._calculate_drawdown(eq)
         
         return {
-            'equity_curve': df['cumulative_pnl'],
+            'equity_curve': equity,
             'total_pnl': total_return,
             'sharpe_ratio': sharpe,
             'max_drawdown': drawdown,
-            'full_df': df
+            'full_df': signals
         }
     
+    def run_batch(self, x_frame: pd.DataFrame, y_frame: pd.DataFrame, beta: pd.DataFrame, position: pd.DataFrame):
+        """
+        run() for many pairs at once; every input is dates x pairs with pair i in column i
+        (prices as passed to KalmanFilterReg.process_batch, beta / position from the batch outputs).
+        
+        Returns:
+            dict like run(): 'equity_curve' is a DataFrame (dates x pairs) and the
+            metrics are Series indexed by pair.
+        """
+        net_pnl = self._net_pnl(
+            x_frame.to_numpy(dtype=np.float64), y_frame.to_numpy(dtype=np.float64),
+            position.to_numpy(), beta.to_numpy()
+        )
+        eq = np.cumsum(net_pnl, axis=0)
+        
+        # Column-wise Sharpe (sample std) and max drawdown
+        if len(net_pnl) < 2:
+            sharpe = np.zeros(net_pnl.shape[1]) # Sample std undefined
+        else:
+            mean = net_pnl.mean(axis=0)
+            std = net_pnl.std(axis=0, ddof=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sharpe = np.where(std == 0, 0.0, np.sqrt(252) * mean / std)
+        drawdown = (eq - np.maximum.accumulate(eq, axis=0)).min(axis=0)
+        
+        pairs = position.columns
+        return {
+            'equity_curve': pd.DataFrame(eq, index=position.index, columns=pairs, copy=False),
+            'total_pnl': pd.Series(eq[-1], index=pairs),
+            'sharpe_ratio': pd.Series(sharpe, index=pairs),
+            'max_drawdown': pd.Series(drawdown, index=pairs)
+        }
+    
+    def _net_pnl(self, px, py, pos, beta):
+        """
+        Daily net PnL per 1 unit spread. Arrays are (days,) or (days, pairs).
+        """
+        # 1. Calculate Daily Price Changes ($ per share)
+        # We use diff() because we hold physical shares, not percent returns
+        dY = _diff(py) # Change in Stock A
+        dX = _diff(px) # Change in Stock B
+        
+        # Yesterday's position and hedge ratio (flat before the first bar)
+        pos_lag = _lag(pos)
+        beta_lag = _lag(beta)
+        
+        # Position changes (entering from flat counts at t=0)
+        trades = np.abs(_diff(pos))
+        trades[0] = np.abs(pos[0])
+        
+        # 2. Strategy PnL Formula, net of Transaction Costs
+        # We hold 1 share of Y and Short 'Beta' shares of X
+        # PnL = Position_{t-1} * ( Change_Y - Beta_{t-1} * Change_X )
+        # We pay costs whenever the position CHANGES (Buy or Sell)
+        # Cost estimate: |Change in Position| * (Price_Y + Beta * Price_X) * Cost_Bps
+        return pos_lag * (dY - beta_lag * dX) - trades * (py + beta * px) * self.cost_bps
+    
     def _calculate_sharpe(self, daily_pnl_series):
         # Annualized Sharpe Ratio (assuming 252 trading days)
-        if daily_pnl_series.std() == 0: return 0
-        return np.sqrt(252) * (daily_pnl_series.mean() / daily_pnl_series.std())
+        # Single conversion to ndarray; std computed once (sample std, ddof=1)
+        a = np.asarray(daily_pnl_series, dtype=np.float64)
+        a = a[~np.isnan(a)]
+        if a.size < 2: return 0.0 # Sample std undefined
+        s = a.std(ddof=1)
+        if s == 0: return 0.0
+        return float(np.sqrt(252) * a.mean() / s)
     
     def _calculate_drawdown(self, equity_curve):
         # Rolling Max
-        peak = equity_curve.cummax()
-        drawdown = equity_curve - peak
-        return drawdown.min()
\ No newline at end of file
+        eq = np.asarray(equity_curve, dtype=np.float64)
+        peak = np.maximum.accumulate(eq)
+        return float((eq - peak).min())
\ No newline at end of file
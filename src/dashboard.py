@@ -29,8 +29,8 @@ if st.sidebar.button("Run Backtest"):
             
             strat = StrategyAnalyzer(entry_threshold=entry_z, exit_threshold=0.0)
             signals = strat.generate_signals(kf_results)
-            signals[ticker_x] = df[ticker_x]
-            signals[ticker_y] = df[ticker_y]
+            signals[ticker_x] = df[ticker_x].to_numpy()
+            signals[ticker_y] = df[ticker_y].to_numpy()
             
             bt = VectorizedBacktester(transaction_cost_bps=0.0005)
             metrics = bt.run(signals, ticker_x, ticker_y)
@@ -50,24 +50,29 @@ if st.sidebar.button("Run Backtest"):
             fig_equity.update_layout(title="Strategy Performance (PnL)", template="plotly_dark", height=400)
             st.plotly_chart(fig_equity, use_container_width=True)
             
+            # Plot inputs as arrays (all frames share df's index)
+            dates = signals.index
+            z = signals['z_score'].to_numpy()
+            position = signals['position'].to_numpy()
+            
             # 2. Dynamic Beta
             fig_beta = go.Figure()
-            fig_beta.add_trace(go.Scatter(x=kf_results.index, y=kf_results['beta'], 
+            fig_beta.add_trace(go.Scatter(x=dates, y=signals['beta'].to_numpy(), 
                                           name='Kalman Beta', line=dict(color='cyan')))
             fig_beta.update_layout(title=f"Adaptive Hedge Ratio ({ticker_x}/{ticker_y})", template="plotly_dark", height=300)
             st.plotly_chart(fig_beta, use_container_width=True)
             
             # 3. Z-Score Signals
             fig_z = go.Figure()
-            fig_z.add_trace(go.Scatter(x=signals.index, y=signals['z_score'], name='Z-Score', line=dict(color='gray')))
+            fig_z.add_trace(go.Scatter(x=dates, y=z, name='Z-Score', line=dict(color='gray')))
             fig_z.add_hline(y=entry_z, line_dash="dash", line_color="red")
             fig_z.add_hline(y=-entry_z, line_dash="dash", line_color="green")
             
             # Add Trades
-            longs = signals[signals['position'] == 1]
-            shorts = signals[signals['position'] == -1]
-            fig_z.add_trace(go.Scatter(x=longs.index, y=longs['z_score'], mode='markers', name='Long', marker=dict(color='green', size=6)))
-            fig_z.add_trace(go.Scatter(x=shorts.index, y=shorts['z_score'], mode='markers', name='Short', marker=dict(color='red', size=6)))
+            longs = position == 1
+            shorts = position == -1
+            fig_z.add_trace(go.Scatter(x=dates[longs], y=z[longs], mode='markers', name='Long', marker=dict(color='green', size=6)))
+            fig_z.add_trace(go.Scatter(x=dates[shorts], y=z[shorts], mode='markers', name='Short', marker=dict(color='red', size=6)))
             
             fig_z.update_layout(title="Trading Signals", template="plotly_dark", height=300)
             st.plotly_chart(fig_z, use_container_width=True)
@@ -1,18 +1,55 @@
 import pandas as pd
+import numpy as np
 from curl_cffi import requests
-from datetime import datetime
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import tempfile
 import time
+import os
+
+# On-disk cache of fetched price series, keyed by (ticker, start, end)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cache')
+CACHE_MAX_AGE = 24 * 60 * 60  # Seconds before a cached series is re-fetched
+
+# Persistent HTTP sessions reuse the TLS connection across requests.
+# curl_cffi sessions are not thread-safe, so each fetch worker keeps its own;
+# the worker pool is module-level so those sessions outlive a single call.
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+_THREAD_LOCAL = threading.local()
+
+def _get_session() -> requests.Session:
+    """Returns this thread's Chrome-impersonating curl_cffi Session."""
+    session = getattr(_THREAD_LOCAL, 'session', None)
+    if session is None:
+        session = requests.Session(impersonate="chrome110")
+        _THREAD_LOCAL.session = session
+    return session
 
 def get_unix_timestamp(date_str: str) -> int:
-    """Converts YYYY-MM-DD to Unix Timestamp."""
-    dt = datetime.strptime(date_str, "%Y-%m-%d")
-    return int(time.mktime(dt.timetuple()))
+    """Converts YYYY-MM-DD to Unix Timestamp (UTC midnight, as Yahoo expects)."""
+    dt = datetime.fromisoformat(date_str).replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
 
 def fetch_single_ticker(ticker: str, start_str: str, end_str: str) -> pd.Series:
     """
     Fetches daily Adj Close data for a single ticker using curl_cffi 
     to bypass Yahoo Finance TLS fingerprinting.
+    Results are cached as parquet under data/cache/ for CACHE_MAX_AGE.
     """
+    cache_path = os.path.join(CACHE_DIR, f"{ticker}_{start_str}_{end_str}.parquet")
+    if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < CACHE_MAX_AGE:
+        print(f"   -> Loading {ticker} from cache...")
+        try:
+            return pd.read_parquet(cache_path)['price'].rename(ticker)
+        except Exception as e:
+            # Unreadable cache file: drop it and fall through to a fresh fetch
+            print(f"⚠️ Ignoring bad cache for {ticker}: {e}")
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+    
     period1 = get_unix_timestamp(start_str)
     period2 = get_unix_timestamp(end_str)
     
@@ -29,11 +66,10 @@ def fetch_single_ticker(ticker: str, start_str: str, end_str: str) -> pd.Series:
     print(f"   -> Requesting {ticker} via curl_cffi (impersonating Chrome)...")
     
     try:
-        # The Magic Line: impersonate="chrome" makes the server think we are a real browser
-        response = requests.get(
+        # The Magic Line: the session impersonates Chrome so the server thinks we are a real browser
+        response = _get_session().get(
             url, 
             params=params, 
-            impersonate="chrome110",
             timeout=10
         )
         response.raise_for_status()
@@ -50,12 +86,24 @@ def fetch_single_ticker(ticker: str, start_str: str, end_str: str) -> pd.Series:
         else:
             prices = result['indicators']['quote'][0]['close']
             
-        # Create Series
-        ts_dates = pd.to_datetime(timestamps, unit='s')
-        series = pd.Series(prices, index=ts_dates, name=ticker)
+        # Create Series from a contiguous float64 buffer (None -> NaN)
+        # datetime64 epoch seconds give a tz-naive index for easy merging
+        ts_dates = pd.DatetimeIndex(np.asarray(timestamps, dtype='datetime64[s]'))
+        series = pd.Series(np.array(prices, dtype=np.float64), index=ts_dates, name=ticker, copy=False)
         
-        # Remove timezone info to allow easy merging
-        series.index = series.index.tz_localize(None)
+        # Cache for subsequent runs (a failed write only costs a re-fetch)
+        # Write to a temp file and rename so readers never see a partial file
+        tmp_path = None
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.parquet.tmp', dir=CACHE_DIR)
+            os.close(fd)
+            series.to_frame('price').to_parquet(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"⚠️ Could not cache {ticker}: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
         
         return series
         
@@ -69,9 +117,12 @@ def fetch_pair_data(ticker_a: str, ticker_b: str, start_date: str, end_date: str
     """
     print(f"📥 Starting Custom Data Pipeline for {ticker_a} & {ticker_b}...")
     
-    # Fetch individually
-    s1 = fetch_single_ticker(ticker_a, start_date, end_date)
-    s2 = fetch_single_ticker(ticker_b, start_date, end_date)
+    # Fetch both tickers concurrently (independent network round-trips)
+    futures = [
+        _EXECUTOR.submit(fetch_single_ticker, ticker_a, start_date, end_date),
+        _EXECUTOR.submit(fetch_single_ticker, ticker_b, start_date, end_date)
+    ]
+    s1, s2 = [f.result() for f in futures]
     
     if s1.empty or s2.empty:
         print("❌ Critical Error: One or both tickers returned no data.")
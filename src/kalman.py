@@ -1,6 +1,101 @@
 import numpy as np
 import pandas as pd
 
+try:
+    from ._njit import njit, prange, aot_kernel
+except ImportError:
+    from _njit import njit, prange, aot_kernel
+
+
+@njit(cache=True, fastmath=True)
+def _kalman_loop(X, Y, delta, R, m0, p0):
+    """
+    Compiled core of the recursive filter (see KalmanFilterReg.process_data).
+    
+    The recursion runs in float64 for a stable covariance update; outputs are
+    stored as float32, which is ample for z-scores and halves downstream bandwidth.
+    
+    Returns:
+        beta, spread, var, std arrays plus the final (state_mean, state_cov).
+    """
+    n = len(X)
+    
+    # Output Containers
+    beta_estimates = np.empty(n, np.float32)
+    spread_errors = np.empty(n, np.float32)
+    error_vars = np.empty(n, np.float32)
+    error_stds = np.empty(n, np.float32)
+    
+    m = m0  # Beta
+    p = p0  # Uncertainty (P)
+    
+    # --- THE RECURSIVE LOOP ---
+    for t in range(n):
+        # 1. PREDICT STEP
+        # Random Walk: Beta is unchanged, uncertainty grows by Q (P_t = P_{t-1} + Q)
+        p += delta
+        
+        # 2. UPDATE STEP
+        # Observation Matrix H is simply the price of X at time t
+        H = X[t]
+        
+        # Innovation (The "Spread"): Actual Y minus Expected Y (based on prev Beta)
+        err = Y[t] - H * m
+        
+        # Innovation Covariance (S = H*P*H' + R)
+        S = p * H * H + R
+        
+        # Kalman Gain (K = P*H' / S), kept as P/S so H is applied once below
+        k_over_h = p / S
+        
+        # Update State Estimate and Covariance (Uncertainty)
+        # P*(1 - K*H) = P*(S - P*H*H)/S = P*R/S, one multiply instead of three ops
+        m += k_over_h * H * err
+        p = R * k_over_h
+        
+        # Store values
+        beta_estimates[t] = np.float32(m)
+        spread_errors[t] = np.float32(err)
+        error_vars[t] = np.float32(S) # We save 'S' to normalize the spread later
+        error_stds[t] = np.float32(np.sqrt(S)) # ...and sqrt(S) so nobody re-computes it
+        
+    return beta_estimates, spread_errors, error_vars, error_stds, m, p
+
+
+@njit(cache=True, parallel=True)
+def _kalman_loop_batch(X, Y, delta, R, m0, p0):
+    """
+    _kalman_loop over many pairs at once. X and Y are (pairs, days) arrays.
+    The recursion stays serial in time; independent pairs run in parallel.
+    
+    Returns:
+        (pairs, days) beta, spread, var, std arrays plus per-pair final state.
+    """
+    P, T = X.shape
+    
+    beta_estimates = np.empty((P, T), np.float32)
+    spread_errors = np.empty((P, T), np.float32)
+    error_vars = np.empty((P, T), np.float32)
+    error_stds = np.empty((P, T), np.float32)
+    m = np.empty(P)
+    p = np.empty(P)
+    
+    for i in prange(P):
+        beta_i, spread_i, var_i, std_i, m_i, p_i = _kalman_loop(X[i], Y[i], delta, R, m0, p0)
+        beta_estimates[i] = beta_i
+        spread_errors[i] = spread_i
+        error_vars[i] = var_i
+        error_stds[i] = std_i
+        m[i] = m_i
+        p[i] = p_i
+        
+    return beta_estimates, spread_errors, error_vars, error_stds, m, p
+
+
+# Precompiled copy of _kalman_loop (python build_aot.py); skips JIT on first call
+_kalman_loop_aot = aot_kernel('kalman_loop', _kalman_loop)
+
+
 class KalmanFilterReg:
     """
     A Kalman Filter implementation specifically for dynamic regression (Pairs Trading).
@@ -21,65 +116,60 @@ class KalmanFilterReg:
         self.R = R          # Measurement noise (R)
         
         # Initial State Estimates
-        self.state_mean = 0  # Initial Beta
-        self.state_cov = 1   # Initial Uncertainty (P)
+        self.state_mean = 0.0  # Initial Beta
+        self.state_cov = 1.0   # Initial Uncertainty (P)
         
     def process_data(self, x_series: pd.Series, y_series: pd.Series):
         """
         Runs the Recursive Filter over the dataset.
+        The per-timestep recursion is compiled with Numba (see _kalman_loop).
         
         Returns:
             pd.DataFrame containing:
             - 'beta': The dynamic hedge ratio
             - 'spread': The prediction error (Tradeable Signal)
-            - 'var': The variance of the prediction error (for Z-Score normalization)
+            - 'spread_var': The variance of the prediction error
+            - 'spread_std': Its standard deviation (for Z-Score normalization)
         """
-        n = len(x_series)
-        X = x_series.values
-        Y = y_series.values
-        
-        # Output Containers
-        beta_estimates = np.zeros(n)
-        spread_errors = np.zeros(n)
-        error_vars = np.zeros(n)
-        
-        # --- THE RECURSIVE LOOP ---
-        for t in range(n):
-            # 1. PREDICT STEP
-            # Project state ahead (Random Walk: x_t = x_{t-1})
-            pred_state = self.state_mean 
-            # Project error covariance (P_t = P_{t-1} + Q)
-            pred_cov = self.state_cov + self.delta
-            
-            # 2. UPDATE STEP
-            # Observation Matrix H is simply the price of X at time t
-            H = X[t]
-            
-            # Calculate Innovation (The "Spread")
-            # This is the difference between Actual Y and Expected Y (based on prev Beta)
-            y_pred = H * pred_state
-            error = Y[t] - y_pred 
-            
-            # Innovation Covariance (S = H*P*H' + R)
-            S = H * pred_cov * H + self.R
-            
-            # Kalman Gain (K = P*H' / S)
-            # Determines how much we trust the new data vs our old model
-            K = (pred_cov * H) / S
-            
-            # Update State Estimate (New Beta = Old Beta + Gain * Error)
-            self.state_mean = pred_state + K * error
-            
-            # Update Covariance (Uncertainty)
-            self.state_cov = pred_cov * (1 - K * H)
-            
-            # Store values
-            beta_estimates[t] = self.state_mean
-            spread_errors[t] = error
-            error_vars[t] = S # We save 'S' to normalize the spread later
-            
+        # Contiguous float64 buffers give the compiled loop unit-stride loads
+        # (and a single kernel specialization regardless of input dtype)
+        X = np.ascontiguousarray(x_series.to_numpy(), dtype=np.float64)
+        Y = np.ascontiguousarray(y_series.to_numpy(), dtype=np.float64)
+        
+        # X, Y are float64 above, exactly the AOT export's signature
+        kalman_loop = _kalman_loop_aot if _kalman_loop_aot is not None else _kalman_loop
+        beta_estimates, spread_errors, error_vars, error_stds, self.state_mean, self.state_cov = kalman_loop(
+            X, Y, self.delta, self.R, self.state_mean, self.state_cov
+        )
+        
         return pd.DataFrame({
             'beta': beta_estimates,
             'spread': spread_errors,
-            'spread_var': error_vars
-        }, index=x_series.index)
\ No newline at end of file
+            'spread_var': error_vars,
+            'spread_std': error_stds
+        }, index=x_series.index)
+    
+    def process_batch(self, x_frame: pd.DataFrame, y_frame: pd.DataFrame):
+        """
+        Runs the Recursive Filter over many pairs in one compiled call.
+        Column i of x_frame and y_frame (dates x pairs, aligned, no NaNs) form pair i.
+        Every pair starts from the current state_mean / state_cov, which are left unchanged.
+        
+        Returns:
+            dict of pd.DataFrame (dates x pairs, columns of y_frame) with the same
+            keys as the process_data columns: 'beta', 'spread', 'spread_var', 'spread_std'.
+        """
+        # (pairs, days) C-order so each pair's time series is contiguous
+        X = np.ascontiguousarray(x_frame.to_numpy(dtype=np.float64).T)
+        Y = np.ascontiguousarray(y_frame.to_numpy(dtype=np.float64).T)
+        
+        beta_estimates, spread_errors, error_vars, error_stds, _, _ = _kalman_loop_batch(
+            X, Y, self.delta, self.R, float(self.state_mean), float(self.state_cov)
+        )
+        
+        # Transposed views (copy=False): no copy back to (days, pairs)
+        return {
+            name: pd.DataFrame(arr.T, index=x_frame.index, columns=y_frame.columns, copy=False)
+            for name, arr in (('beta', beta_estimates), ('spread', spread_errors),
+                              ('spread_var', error_vars), ('spread_std', error_stds))
+        }
\ No newline at end of file
@@ -1,5 +1,4 @@
 import statsmodels.tsa.stattools as ts
-import statsmodels.api as sm
 import pandas as pd
 import numpy as np
 
@@ -14,13 +13,17 @@ def check_cointegration(asset_a: pd.Series, asset_b: pd.Series):
         dict: Contains t-statistic, p-value, and critical values.
     """
     # Step 1: OLS Regression to find the static hedge ratio (beta)
-    # We add a constant (intercept) to the independent variable
-    X = sm.add_constant(asset_b) 
-    model = sm.OLS(asset_a, X).fit()
-    beta = model.params.iloc[1]
+    # Closed form for a single regressor with intercept:
+    # beta = cov(a, b) / var(b), alpha = mean(a) - beta * mean(b)
+    a = asset_a.to_numpy(dtype=np.float64)
+    b = asset_b.to_numpy(dtype=np.float64)
+    a_mean = a.mean()
+    bc = b - b.mean()
+    beta = (bc * (a - a_mean)).sum() / (bc * bc).sum()
     
-    # Calculate the spread (residuals)
-    spread = asset_a - (beta * asset_b)
+    # Calculate the spread (residuals: a - alpha - beta * b)
+    # The intercept does not change the ADF statistic, which fits its own constant
+    spread = a - a_mean - beta * bc
     
     # Step 2: Augmented Dickey-Fuller (ADF) Test on the spread
     # If p-value < 0.05, the spread is stationary -> Pairs are Cointegrated
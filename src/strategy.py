@@ -1,6 +1,71 @@
 import pandas as pd
 import numpy as np
 
+try:
+    from ._njit import njit, prange, aot_kernel
+except ImportError:
+    from _njit import njit, prange, aot_kernel
+
+
+@njit(cache=True)
+def _position_fsm(z, entry, exit_):
+    """
+    Position state machine over the Z-Score series.
+    
+    Returns:
+        int8 array of positions (0=Flat, 1=Long, -1=Short).
+    """
+    n = len(z)
+    out = np.empty(n, np.int8)
+    cur = 0
+    
+    for t in range(n):
+        zt = z[t]
+        
+        if cur == 0:
+            if zt < -entry:
+                cur = 1  # Open Long
+            elif zt > entry:
+                cur = -1 # Open Short
+        
+        elif cur == 1: # We are Long
+            if zt >= -exit_:
+                cur = 0 # Close Position
+        
+        elif cur == -1: # We are Short
+            if zt <= exit_:
+                cur = 0 # Close Position
+        
+        out[t] = cur
+        
+    return out
+
+
+@njit(cache=True, parallel=True)
+def _position_fsm_batch(z, entry, exit_):
+    """
+    _position_fsm over many pairs at once. z is a (pairs, days) array.
+    
+    Returns:
+        (pairs, days) int8 array of positions.
+    """
+    P, T = z.shape
+    out = np.empty((P, T), np.int8)
+    
+    for i in prange(P):
+        out[i] = _position_fsm(z[i], entry, exit_)
+        
+    return out
+
+
+# Precompiled copies of _position_fsm (python build_aot.py), keyed by z dtype
+# (pycc exports don't type-check, so each is only used for its exact dtype)
+_POSITION_FSM_AOT = {
+    np.dtype(np.float32): aot_kernel('position_fsm_f4', _position_fsm),
+    np.dtype(np.float64): aot_kernel('position_fsm_f8', _position_fsm),
+}
+
+
 class StrategyAnalyzer:
     """
     Takes the output of the Kalman Filter and generates trading signals.
@@ -12,59 +77,55 @@ class StrategyAnalyzer:
         
     def generate_signals(self, kf_results: pd.DataFrame) -> pd.DataFrame:
         """
-        Adds Signal columns to the dataframe.
+        Adds 'z_score' and 'position' columns to kf_results IN PLACE and returns it.
+        The frame is not copied (on any pandas version); callers that need the
+        original columns only should pass kf_results.copy().
         
         Logic:
-        - Z-Score = Spread / sqrt(Spread_Variance)
+        - Z-Score = Spread / Spread_Std (= sqrt(Spread_Variance))
         - Long Signal (1): Z < -Threshold
         - Short Signal (-1): Z > Threshold
         - Exit (0): Z crosses 0
         """
-        df = kf_results.copy()
+        spread = kf_results['spread'].to_numpy()
+        std = kf_results['spread_std'].to_numpy()
         
         # 1. Calculate Z-Score (Dynamic Normalization)
-        # We use sqrt(spread_var) because the Kalman Filter outputs Variance (S), 
-        # but Z-score needs Standard Deviation.
-        df['z_score'] = df['spread'] / np.sqrt(df['spread_var'])
-        
-        # 2. Vectorized Signal Generation
-        df['long_entry'] = df['z_score'] < -self.entry_threshold
-        df['short_entry'] = df['z_score'] > self.entry_threshold
-        
-        # Exits (Mean Reversion)
-        # We exit longs when Z rises back above -0.5 (or 0)
-        # We exit shorts when Z falls back below 0.5 (or 0)
-        # For simplicity in this phase, we look for Z crossing Zero.
-        df['exit_long'] = df['z_score'] >= -self.exit_threshold
-        df['exit_short'] = df['z_score'] <= self.exit_threshold
-        
-        # 3. Create a Consolidated 'Position' Column (1, -1, 0)
+        # Z-score needs Standard Deviation; the Kalman Filter stores sqrt(S)
+        # alongside the Variance (S), so no square root is taken here.
+        # A zero variance yields inf/NaN here instead of a RuntimeWarning.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = spread / std
+        
+        # 2. Create a Consolidated 'Position' Column (1, -1, 0)
+        # Entries: Long when Z < -Threshold, Short when Z > Threshold
+        # Exits (Mean Reversion): Z crosses back through the exit threshold (0)
         # This requires a loop because current position depends on previous state
-        # (State Machine logic)
-        positions = np.zeros(len(df))
-        current_pos = 0 # 0=Flat, 1=Long, -1=Short
-        
-        z_scores = df['z_score'].values
-        
-        for t in range(len(df)):
-            z = z_scores[t]
-            
-            if current_pos == 0:
-                if z < -self.entry_threshold:
-                    current_pos = 1  # Open Long
-                elif z > self.entry_threshold:
-                    current_pos = -1 # Open Short
-            
-            elif current_pos == 1: # We are Long
-                if z >= -self.exit_threshold:
-                    current_pos = 0 # Close Position
-            
-            elif current_pos == -1: # We are Short
-                if z <= self.exit_threshold:
-                    current_pos = 0 # Close Position
-            
-            positions[t] = current_pos
-            
-        df['position'] = positions
-        
-        return df
\ No newline at end of file
+        # (State Machine logic), so it runs as a compiled kernel
+        position_fsm = _POSITION_FSM_AOT.get(z.dtype) or _position_fsm
+        position = position_fsm(z, self.entry_threshold, self.exit_threshold)
+        
+        kf_results['z_score'] = z
+        kf_results['position'] = position
+        
+        return kf_results
+    
+    def generate_batch_signals(self, kf_batch: dict) -> dict:
+        """
+        generate_signals for the output of KalmanFilterReg.process_batch.
+        
+        Returns:
+            dict of pd.DataFrame (dates x pairs): 'z_score' and 'position'.
+        """
+        spread = kf_batch['spread']
+        
+        # (pairs, days) views of the Kalman output (stored pair-major)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.ascontiguousarray(spread.to_numpy().T / kf_batch['spread_std'].to_numpy().T)
+        
+        position = _position_fsm_batch(z, self.entry_threshold, self.exit_threshold)
+        
+        return {
+            'z_score': pd.DataFrame(z.T, index=spread.index, columns=spread.columns, copy=False),
+            'position': pd.DataFrame(position.T, index=spread.index, columns=spread.columns, copy=False)
+        }
\ No newline at end of file